@@ -5,10 +5,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.metrics import mean_absolute_error
 from retrospective_analysis.metrics import max_error, mean_difference
+from retrospective_analysis.data_loading import load_truth
 from retrospective_analysis.evaluate_scenarios import (
     evaluate_all_scenarios,
     evaluate_all_scenarios_with_dates,
     compute_metrics_all_scenarios,
+    oracle_trajectories_all_scenarios,
 )
 
 # Set matplotlib style
@@ -74,6 +76,12 @@ data_location = {
     "2022/01/07 ICU": "data_preparation/output_data/min_med_max_and_error/ICU_error/2022_01_07_ICU_error.csv",
 }
 
+# shared reality series, keyed by endpoint and region
+reality_location = {
+    ("ICU", "France"): "data_preparation/output_data/reality/ICU_reality.csv",
+    ("New hosp.", "France"): "data_preparation/output_data/reality/new_hosp_reality.csv",
+}
+
 normalizations = {
     "2020/10/30 ICU": icu_normalization,
     "2021/02/08": new_hosp_normalization,
@@ -140,6 +148,36 @@ with open(
 ) as f:
     results_with_dates.to_csv(f)
 
+results_oracle = oracle_trajectories_all_scenarios(
+    data_location, normalizations=normalizations, window_length=14
+)
+with open(
+    results_path + "oracle_trajectories_rolling_windows.csv", "w", encoding="utf-8-sig"
+) as f:
+    results_oracle.to_csv(f)
+
+# same metrics with reality joined from the shared reality series instead of the
+# copy embedded in each scenario file
+# 2021/02/14 is left out: its reality data differs from the shared series
+data_location_shared_reality = {
+    scenario: url for scenario, url in data_location.items() if scenario != "2021/02/14"
+}
+truths = {key: load_truth(url) for key, url in reality_location.items()}
+regions = {scenario: "France" for scenario in data_location_shared_reality}
+
+results_shared_reality = evaluate_all_scenarios(
+    data_location_shared_reality,
+    metrics=metrics,
+    normalizations=normalizations,
+    increasing=increasing,
+    truths=truths,
+    regions=regions,
+)
+with open(
+    results_path + "error_metrics_shared_reality.csv", "w", encoding="utf-8-sig"
+) as f:
+    results_shared_reality.to_csv(f)
+
 # ------------------------------------------------------------------------------------------------------
 
 
@@ -1,7 +1,14 @@
 from .metrics import max_error, mean_difference
-from .data_loading import load_dataframe, moving_average, add_baselines
+from .data_loading import (
+    load_dataframe,
+    load_truth,
+    moving_average,
+    add_baselines,
+    add_errors,
+)
 from .evaluate_scenarios import (
     compute_metrics,
     compute_metrics_all_scenarios,
     evaluate_all_scenarios,
+    oracle_trajectories_all_scenarios,
 )
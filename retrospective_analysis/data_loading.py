@@ -37,10 +37,60 @@ def add_baselines(df, start_date):
     return df
 
 
-def load_dataframe(url, start_date=None, baseline=True, remove_na=True):
+def load_truth(url):
+    truth = pd.read_csv(url, decimal=",")
+    truth = pd.Series(
+        pd.to_numeric(truth["reality"]).values,
+        index=pd.to_datetime(truth["date"]),
+        name="reality",
+    ).sort_index()
+    truth = truth[truth.index.notna()]
+    if truth.empty:
+        raise ValueError("No dated values in truth file {}".format(url))
+    if not truth.index.is_unique:
+        duplicated_dates = truth.index[truth.index.duplicated()].unique()
+        raise ValueError(
+            "Duplicated dates in truth file {}: {}".format(
+                url, ", ".join(duplicated_dates.strftime("%Y-%m-%d"))
+            )
+        )
+    # one value per day so that a date maps to a position by its day offset
+    return truth.reindex(pd.date_range(truth.index[0], truth.index[-1], freq="D"))
+
+
+def join_truth(df, truth):
+    offsets = (pd.to_datetime(df.index) - truth.index[0]).days.values
+    in_range = (offsets >= 0) & (offsets < len(truth))
+    df["reality"] = np.where(
+        in_range, truth.values[np.clip(offsets, 0, len(truth) - 1)], np.nan
+    )
+    return df
+
+
+# errors of the min, med and max scenarios, in % of normalization
+# the error columns of the scenario files are reproduced with the endpoints'
+# historical peaks, i.e. normalization = 6937 / 100 for ICU and 3036 / 100 for
+# new hospitalizations (endpoints_normalizations in get_results.py), not with
+# the rounded normalizations used by the evaluation functions
+def add_errors(df, normalization):
+    for scenario_name in ["min", "med", "max"]:
+        df[f"error_{scenario_name}"] = (
+            (pd.to_numeric(df[scenario_name]) - pd.to_numeric(df["reality"]))
+            / normalization
+        ).round(1)
+    return df
+
+
+def load_dataframe(url, start_date=None, baseline=True, remove_na=True, truth=None):
     df = pd.read_csv(url, decimal=",")
     df = df.set_index("date")
 
+    # scenario files may carry only predictions, reality then comes from a
+    # shared truth series (see load_truth), which replaces any reality column
+    # of the file
+    if truth is not None:
+        df = join_truth(df, truth)
+
     # to remove in the future
     # cope with issues in data processing
     try:
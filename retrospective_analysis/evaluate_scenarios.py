@@ -7,6 +7,15 @@ icu_normalization = 7000 / 100
 idf_icu_normalization = 2600 / 100
 
 
+# reality series of a scenario, keyed by endpoint and region
+def scenario_truth(truths, regions, scenario, scenario_type):
+    if not truths:
+        return None
+    if regions is None or scenario not in regions:
+        raise ValueError("No region given for scenario {}".format(scenario))
+    return truths[(scenario_type, regions[scenario])]
+
+
 def compute_metrics(df, metrics, scenario_name="low", normalization=1, increasing=True):
     results = {}
     for i, (metric_name, metric) in enumerate(metrics.items()):
@@ -19,7 +28,9 @@ def compute_metrics(df, metrics, scenario_name="low", normalization=1, increasin
     return results
 
 
-def evaluate_all_scenarios(urls, metrics, normalizations, increasing):
+def evaluate_all_scenarios(
+    urls, metrics, normalizations, increasing, truths=None, regions=None
+):
     results = {}
     column_names = list(metrics.keys())
     column_names = [
@@ -42,7 +53,11 @@ def evaluate_all_scenarios(urls, metrics, normalizations, increasing):
             scenario_type = "ICU"
         else:
             scenario_type = "New hosp."
-        df = load_dataframe(url, start_date=scenario.split()[0].replace("/", "-"))
+        df = load_dataframe(
+            url,
+            start_date=scenario.split()[0].replace("/", "-"),
+            truth=scenario_truth(truths, regions, scenario, scenario_type),
+        )
         df = df.apply(pd.to_numeric)
         dict_results = {}
 
@@ -88,6 +103,8 @@ def compute_metrics_all_scenarios(
     scenario_name="low",
     n_days=None,
     baseline=True,
+    truths=None,
+    regions=None,
 ):
     results = {}
     column_names = list(metrics.keys()) + ["Increasing"] + ["MAPE"]
@@ -105,7 +122,11 @@ def compute_metrics_all_scenarios(
             scenario_type = "ICU"
         else:
             scenario_type = "New hosp."
-        df = load_dataframe(url, start_date=scenario.split()[0].replace("/", "-"))
+        df = load_dataframe(
+            url,
+            start_date=scenario.split()[0].replace("/", "-"),
+            truth=scenario_truth(truths, regions, scenario, scenario_type),
+        )
         df = df.apply(pd.to_numeric)
         if n_days:
             dict_results = compute_metrics(
@@ -137,7 +158,13 @@ def compute_metrics_all_scenarios(
 
 
 def evaluate_all_scenarios_with_dates(
-    urls, metrics, normalizations, increasing, bins_length=14
+    urls,
+    metrics,
+    normalizations,
+    increasing,
+    bins_length=14,
+    truths=None,
+    regions=None,
 ):
     results = {}
     column_names = list(metrics.keys())
@@ -165,7 +192,11 @@ def evaluate_all_scenarios_with_dates(
         else:
             scenario_type = "New hosp."
         normalization = 1
-        df = load_dataframe(url, start_date=scenario.split()[0].replace("/", "-"))
+        df = load_dataframe(
+            url,
+            start_date=scenario.split()[0].replace("/", "-"),
+            truth=scenario_truth(truths, regions, scenario, scenario_type),
+        )
         df = df.apply(pd.to_numeric)
         dict_results = {}
         for i in range(int(len(df) / bins_length)):
@@ -252,3 +283,97 @@ def evaluate_all_scenarios_with_dates(
     return pd.DataFrame.from_dict(results, orient="index", columns=column_names).round(
         1
     )
+
+
+# columns of the scenario files which are not modelled trajectories
+non_trajectory_columns = [
+    "reality",
+    "med",
+    "min",
+    "max",
+    "error_min",
+    "error_med",
+    "error_max",
+    "Constant",
+    "1st order",
+    "2nd order",
+]
+
+
+def oracle_trajectories_all_scenarios(
+    urls, normalizations, window_length=14, truths=None, regions=None
+):
+    results = {}
+    column_names = [
+        "Scenario",
+        "Scenario type",
+        "Window start",
+        "Window end",
+        "Best trajectory",
+        "Oracle MAE (beds)",
+        "Oracle MAE",
+    ]
+    for i, (scenario, url) in enumerate(urls.items()):
+        normalization = normalizations[scenario]
+        if normalization == icu_normalization or normalization == idf_icu_normalization:
+            scenario_type = "ICU"
+        else:
+            scenario_type = "New hosp."
+        df = load_dataframe(
+            url,
+            start_date=scenario.split()[0].replace("/", "-"),
+            baseline=False,
+            truth=scenario_truth(truths, regions, scenario, scenario_type),
+        )
+        df = df.apply(pd.to_numeric)
+        trajectories = [x for x in df.columns if x not in non_trajectory_columns]
+        if len(df) < window_length or not trajectories:
+            continue
+        # one row per day, so that windows spanning missing days are excluded below
+        df.index = pd.to_datetime(df.index)
+        df = df.reindex(pd.date_range(df.index[0], df.index[-1], freq="D"))
+        df.index = df.index.strftime("%Y-%m-%d")
+
+        # absolute errors of all trajectories at once, shape (days, trajectories)
+        errors = np.abs(
+            df[trajectories].values - df["reality"].values[:, np.newaxis]
+        )
+        observed = ~np.isnan(errors)
+        errors = np.where(observed, errors, 0)
+
+        # windowed sums through cumulative sums: sum[t:t+w] = cumsum[t+w] - cumsum[t]
+        padding = np.zeros((1, len(trajectories)))
+        errors_cumsum = np.concatenate([padding, np.cumsum(errors, axis=0)])
+        observed_cumsum = np.concatenate([padding, np.cumsum(observed, axis=0)])
+        window_errors = errors_cumsum[window_length:] - errors_cumsum[:-window_length]
+        window_observed = (
+            observed_cumsum[window_length:] - observed_cumsum[:-window_length]
+        )
+
+        # trajectories not covering the whole window cannot be selected
+        window_mae = np.full(window_errors.shape, np.inf)
+        np.divide(
+            window_errors,
+            window_length,
+            out=window_mae,
+            where=window_observed == window_length,
+        )
+        best = np.argmin(window_mae, axis=1)
+        oracle_mae = window_mae[np.arange(len(best)), best]
+
+        for j in np.where(np.isfinite(oracle_mae))[0]:
+            window_start = df.index[j]
+            window_end = df.index[j + window_length - 1]
+            results[f"Scenario: {scenario}, window: {window_start} - {window_end}"] = [
+                scenario,
+                scenario_type,
+                window_start,
+                window_end,
+                trajectories[best[j]],
+                oracle_mae[j],
+                oracle_mae[j] / normalization,
+            ]
+
+    return pd.DataFrame.from_dict(results, orient="index", columns=column_names).round(
+        1
+    )